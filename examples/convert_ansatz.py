@@ -0,0 +1,44 @@
+"""Ansatz Conversion Script.
+
+This script converts ansatz files in the AVQITE pickle format (.pkle) into the binary
+format read by QuimbVqite: an int8 .npy array of Pauli strings, which is
+memory-mapped at load time, and a .json manifest containing the parameters.
+
+Command-line Arguments:
+    files : str
+        Paths to the .pkle ansatz files to convert. If none are given, all
+        ansatz_inp*.pkle files in the 'data_adaptvqite' directory are converted.
+
+Output:
+    For each input file <name>.pkle, creates <name>.npy and <name>.json next to it.
+"""
+
+import argparse
+import glob
+import os
+
+from vqite import vqite_quimb
+
+parser = argparse.ArgumentParser(
+    description="Converts AVQITE .pkle ansatz files into the binary .npy format"
+)
+parser.add_argument(
+    "files",
+    type=str,
+    nargs="*",
+    help="paths to the .pkle ansatz files to convert",
+)
+args = parser.parse_args()
+
+files = args.files
+if not files:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    files = sorted(
+        glob.glob(os.path.join(script_dir, "data_adaptvqite", "*", "ansatz_inp*.pkle"))
+    )
+
+for pkle_file in files:
+    ansatz, params = vqite_quimb.read_adaptvqite_ansatz(pkle_file)
+    npy_file = os.path.splitext(pkle_file)[0] + ".npy"
+    vqite_quimb.write_ansatz_npy(npy_file, ansatz, params)
+    print(f"{pkle_file} -> {npy_file}")
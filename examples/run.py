@@ -11,14 +11,50 @@ Command-line Arguments:
     -i, --init_params : str
         Initial parameters strategy, e.g., 'random', 'zeros' (default: 'random')
     -om, --optimize_m : str
-        Optimizer to use when computing matrix M (default: 'greedy')
+        Optimizer to use when computing matrix M, e.g., 'hyper', 'greedy',
+        'random-greedy' (default: 'hyper')
     -ov, --optimize_v : str
-        Optimizer to use when computing vector V (default: 'greedy')
+        Optimizer to use when computing vector V, e.g., 'hyper', 'greedy',
+        'random-greedy' (default: 'hyper')
     -s, --simplify_sequence : str
         Simplification sequence to use by quimb (default: 'ADCRS')
+    -mt, --max_time : float
+        Time budget in seconds for each contraction path search, only used by the
+        'hyper' optimizer (default: 10.0)
+    -mr, --max_repeats : int
+        Maximum number of paths sampled in each contraction path search by the
+        'hyper' and 'random-greedy' optimizers (default: 128)
+    -t, --temperature : float
+        Temperature of the path sampling of the 'random-greedy' optimizer, which
+        samples paths on every process and uses the best one (default: 0.01)
+    -ga, --greedy_alpha : float
+        Weight alpha of the freed memory in the size-delta objective
+        size(Ti*Tj) - alpha * (size(Ti) + size(Tj)) of the 'greedy' optimizer
+        (default: 1.0)
+    -b, --backend : str
+        Array backend to perform the contractions with, e.g. 'numpy', 'cupy'
+        (GPU, each process uses a GPU of its node) or 'jax' (default: 'numpy')
+    --dtype : str
+        Precision of the contractions, 'c128' (complex128) or 'c64' (complex64).
+        With 'c64', the contractions switch to complex128 as soon as the energy
+        increases in an iteration (default: 'c128')
+    -pc, --path_cache : str
+        File caching the contraction trees between runs, e.g. for restart jobs
+        (default: None, i.e. 'outputs/.path_cache/<key>.json', where the key is a
+        hash of the ansatz, the Hamiltonian, the optimizers and the simplification
+        sequence, such that runs differing only in e.g. the initial parameters
+        share the cached trees)
+    --no_path_cache : flag
+        Do not cache the contraction trees between runs (default: off)
+    --jit : flag
+        Assemble the matrix M and the vector V with Numba-compiled kernels,
+        requires numba (default: off)
+    --profile : flag
+        Profile the VQITE run of rank 0 with cProfile and write the statistics to
+        'outputs/profile_rank0.prof' (default: off)
 
 The script uses MPI for parallel computation, with rank 0 process handling
-initialization and final output, while other ranks participate in the VQITE computation.
+the file output, while all ranks participate in the VQITE computation.
 
 Output:
     Creates output files in the 'outputs' directory with naming convention:
@@ -27,11 +63,12 @@ Output:
 """
 
 import argparse
+import atexit
+import cProfile
 import os
+import sys
 import time
 
-from vqite import vqite_quimb
-
 try:
     from mpi4py import MPI
 
@@ -40,11 +77,30 @@ try:
     comm = MPI.COMM_WORLD
     size = comm.Get_size()
     rank = comm.Get_rank()
+    # Number of processes on this node
+    node_comm = comm.Split_type(MPI.COMM_TYPE_SHARED)
+    local_size = node_comm.Get_size()
+    node_comm.Free()
 except ImportError:
     # Fallback: Serial mode
     mpi_available = False
     rank = 0
     size = 1
+    local_size = 1
+
+# The cores of a node are divided between its processes, such that the threads of
+# BLAS (used by numpy in the contractions) and Numba do not oversubscribe them.
+# This has to be done before numpy is imported, explicit settings are kept.
+n_threads = str(max(1, (os.cpu_count() or 1) // local_size))
+for var in (
+    "OMP_NUM_THREADS",
+    "MKL_NUM_THREADS",
+    "OPENBLAS_NUM_THREADS",
+    "NUMBA_NUM_THREADS",
+):
+    os.environ.setdefault(var, n_threads)
+
+from vqite import vqite_quimb  # noqa: E402
 
 # Set up command-line argument parser
 parser = argparse.ArgumentParser(
@@ -70,7 +126,7 @@ parser.add_argument(
     "-om",
     "--optimize_m",
     type=str,
-    default="greedy",
+    default="hyper",
     metavar="\b",
     help="optimizer to use when computing matrix M",
 )
@@ -78,7 +134,7 @@ parser.add_argument(
     "-ov",
     "--optimize_v",
     type=str,
-    default="greedy",
+    default="hyper",
     metavar="\b",
     help="optimizer to use when computing vector V",
 )
@@ -90,78 +146,198 @@ parser.add_argument(
     metavar="\b",
     help="simplification sequence to use by quimb.",
 )
-args = parser.parse_args()
+parser.add_argument(
+    "-mt",
+    "--max_time",
+    type=float,
+    default=10.0,
+    metavar="\b",
+    help="time budget in seconds for each path search (only used by 'hyper')",
+)
+parser.add_argument(
+    "-mr",
+    "--max_repeats",
+    type=int,
+    default=128,
+    metavar="\b",
+    help="maximum number of paths sampled in each path search",
+)
+parser.add_argument(
+    "-t",
+    "--temperature",
+    type=float,
+    default=0.01,
+    metavar="\b",
+    help="temperature of the path sampling of the 'random-greedy' optimizer",
+)
+parser.add_argument(
+    "-ga",
+    "--greedy_alpha",
+    type=float,
+    default=1.0,
+    metavar="\b",
+    help="weight of the freed memory in the objective of the 'greedy' optimizer",
+)
+parser.add_argument(
+    "-b",
+    "--backend",
+    type=str,
+    default="numpy",
+    metavar="\b",
+    help="array backend to perform the contractions with, e.g. numpy, cupy, jax",
+)
+parser.add_argument(
+    "--dtype",
+    type=str,
+    default="c128",
+    choices=["c128", "c64"],
+    help="precision of the contractions, complex128 or complex64",
+)
+parser.add_argument(
+    "-pc",
+    "--path_cache",
+    type=str,
+    default=None,
+    metavar="\b",
+    help="file caching the contraction trees between runs",
+)
+parser.add_argument(
+    "--no_path_cache",
+    action="store_true",
+    help="do not cache the contraction trees between runs",
+)
+parser.add_argument(
+    "--jit",
+    action="store_true",
+    help="assemble M and V with Numba-compiled kernels (requires numba)",
+)
+parser.add_argument(
+    "--profile",
+    action="store_true",
+    help="profile the VQITE run of rank 0 with cProfile",
+)
 
-# Extract command line arguments
-filename = args.filename
-init_params = args.init_params
-optimize_m = args.optimize_m
-optimize_v = args.optimize_v
-simplify_sequence = args.simplify_sequence
 
-# Set up input and output file paths
-script_dir = os.path.dirname(os.path.abspath(__file__))
-incar_file = os.path.join(script_dir, "incars", f"incar{filename}")
-ansatz_file = os.path.join(script_dir, "data_adaptvqite", filename, "ansatz_inp.pkle")
+def build_config() -> dict:
+    """Parse the command line arguments and set up the input and output paths."""
+    args = parser.parse_args()
+    cfg = vars(args)
 
-outputs_dir = os.path.join(script_dir, "outputs")
-os.makedirs(outputs_dir, exist_ok=True)
-output_file = os.path.join(
-    outputs_dir,
-    f"output{filename}n{size}_{init_params}_om{optimize_m}_ov{optimize_v}_"
-    f"s{simplify_sequence}.txt",
-)
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    cfg["incar_file"] = os.path.join(script_dir, "incars", f"incar{args.filename}")
+    # The binary ansatz format (see convert_ansatz.py) is preferred over the pickle
+    # one.
+    ansatz_file = os.path.join(
+        script_dir, "data_adaptvqite", args.filename, "ansatz_inp.npy"
+    )
+    if not os.path.exists(ansatz_file):
+        ansatz_file = os.path.splitext(ansatz_file)[0] + ".pkle"
+    cfg["ansatz_file"] = ansatz_file
 
+    cfg["outputs_dir"] = os.path.join(script_dir, "outputs")
+    cfg["path_cache_dir"] = os.path.join(cfg["outputs_dir"], ".path_cache")
+    cfg["output_file"] = os.path.join(
+        cfg["outputs_dir"],
+        f"output{args.filename}n{size}_{args.init_params}_om{args.optimize_m}_"
+        f"ov{args.optimize_v}_s{args.simplify_sequence}.txt",
+    )
+    return cfg
+
+
+# Only rank 0 parses the command line arguments and sets up the paths, which are
+# broadcast to the other ranks. If rank 0 exits (e.g. for --help or invalid
+# arguments), the other ranks exit as well.
+cfg = None
+if rank == 0:
+    try:
+        cfg = build_config()
+    except SystemExit:
+        if mpi_available:
+            comm.bcast(cfg, root=0)
+        raise
 if mpi_available:
+    cfg = comm.bcast(cfg, root=0)
+if cfg is None:
+    sys.exit()
+
+# Extract command line arguments
+filename = cfg["filename"]
+init_params = cfg["init_params"]
+optimize_m = cfg["optimize_m"]
+optimize_v = cfg["optimize_v"]
+simplify_sequence = cfg["simplify_sequence"]
+path_cache = cfg["path_cache"]
+no_path_cache = cfg["no_path_cache"]
+max_time = cfg["max_time"]
+max_repeats = cfg["max_repeats"]
+greedy_alpha = cfg["greedy_alpha"]
+temperature = cfg["temperature"]
+backend = cfg["backend"]
+dtype = {"c128": "complex128", "c64": "complex64"}[cfg["dtype"]]
+vqite_quimb.ENABLE_JIT = cfg["jit"]
+profile = cfg["profile"]
+
+# Input and output file paths
+incar_file = cfg["incar_file"]
+ansatz_file = cfg["ansatz_file"]
+outputs_dir = cfg["outputs_dir"]
+path_cache_dir = cfg["path_cache_dir"]
+output_file = cfg["output_file"]
+
+# Only rank 0 sets up the outputs directory and writes to the output file, the
+# other ranks wait for it before proceeding.
+if rank == 0:
+    os.makedirs(outputs_dir, exist_ok=True)
+    if path_cache is None and not no_path_cache:
+        os.makedirs(path_cache_dir, exist_ok=True)
     with open(output_file, "w") as f:
-        print(f"Running in parallel mode with {size} processes", file=f)
-else:
-    with open(output_file, "w") as f:
-        print("MPI not available, running in serial mode", file=f)
+        if mpi_available:
+            print(f"Running in parallel mode with {size} processes", file=f)
+        else:
+            print("MPI not available, running in serial mode", file=f)
+
+    # The output file is kept open (line-buffered) for logging, instead of opening
+    # it for every message.
+    _log_fh = open(output_file, "a", buffering=1)
+    atexit.register(_log_fh.close)
+if mpi_available:
+    comm.Barrier()
 
 
 def log(message: str) -> None:
-    """Log a message to the output file."""
-    global output_file
-    with open(output_file, "a") as f:
-        print(message, file=f)
+    """Log a message to the output file (no-op on ranks other than 0)."""
+    if rank == 0:
+        _log_fh.write(message + "\n")
 
 
-# Initialize VQITE on rank 0 and broadcast parameters to other ranks
-# (this is for the case of random initial parameters such that they are the same on all
-# ranks)
-if rank == 0:
-    if mpi_available:
-        start_time = MPI.Wtime()
-    else:
-        start_time = time.time()
-    vqite_quimb_obj = vqite_quimb.QuimbVqite(
-        incar_file=incar_file,
-        ansatz_file=ansatz_file,
-        output_file=output_file,
-        init_params=init_params,
-    )
-    init_params = vqite_quimb_obj.params
-    if mpi_available:
-        end_time = MPI.Wtime()
-    else:
-        end_time = time.time()
-    log(f"rank={rank}, initialization time: {end_time - start_time}")
+# Initialize VQITE on all ranks (the initialization is collective, random initial
+# parameters are broadcast from rank 0 such that they are the same on all ranks)
+if mpi_available:
+    start_time = MPI.Wtime()
 else:
-    init_params = None
-
-# Broadcast initial parameters from rank 0 to all other ranks
+    start_time = time.time()
+vqite_quimb_obj = vqite_quimb.QuimbVqite(
+    incar_file=incar_file,
+    ansatz_file=ansatz_file,
+    output_file=output_file,
+    init_params=init_params,
+)
 if mpi_available:
-    init_params = comm.bcast(init_params, root=0)
-
-# Initialize VQITE on other ranks with broadcasted parameters
-if rank != 0:
-    vqite_quimb_obj = vqite_quimb.QuimbVqite(
-        incar_file=incar_file,
-        ansatz_file=ansatz_file,
-        output_file=output_file,
-        init_params=init_params,
-    )
+    end_time = MPI.Wtime()
+else:
+    end_time = time.time()
+# The initialization time is reduced over all ranks, such that the slowest rank
+# and the load imbalance between the ranks are reported (not only rank 0's time)
+init_time = end_time - start_time
+if mpi_available:
+    init_time_max = comm.allreduce(init_time, op=MPI.MAX)
+    init_time_min = comm.allreduce(init_time, op=MPI.MIN)
+else:
+    init_time_max = init_time_min = init_time
+log(
+    f"initialization time (max over ranks): {init_time_max}, "
+    f"imbalance (max - min): {init_time_max - init_time_min}"
+)
 
 # with open("adaptvqite/adaptvqite/data/N12g0.5/M_V.pkle", 'rb') as inp:
 #     data_inp = pickle.load(inp)
@@ -186,16 +362,38 @@ if rank != 0:
 #     print(np.where((Vdiff>1e-14) == True))
 
 # Record initial parameters
-if rank == 0:
-    log(f"{vqite_quimb_obj.params}")
+log(f"{vqite_quimb_obj.params}")
+
+# By default, the contraction trees are cached in a file named by the hash of
+# everything they depend on
+if path_cache is None and not no_path_cache:
+    path_cache = os.path.join(
+        path_cache_dir,
+        vqite_quimb_obj.path_cache_key(optimize_m, optimize_v, simplify_sequence)
+        + ".json",
+    )
 
-# Run VQITE
+# Run VQITE (profiled on rank 0 if requested)
+profiler = cProfile.Profile() if profile and rank == 0 else None
+if profiler is not None:
+    profiler.enable()
 vqite_quimb_obj.vqite(
     optimize_m=optimize_m,
     optimize_v=optimize_v,
     simplify_sequence=simplify_sequence,
-    backend=None,
+    path_cache=path_cache,
+    optimizer_opts={
+        "max_time": max_time,
+        "max_repeats": max_repeats,
+        "greedy_alpha": greedy_alpha,
+        "temperature": temperature,
+    },
+    backend=backend,
+    dtype=dtype,
 )
+if profiler is not None:
+    profiler.disable()
+    profiler.dump_stats(os.path.join(outputs_dir, "profile_rank0.prof"))
 
 # Record final results
 log(f"Final energy: {vqite_quimb_obj._e}, {vqite_quimb_obj.params}")
@@ -0,0 +1,82 @@
+"""Numba-compiled kernels for assembling the VQITE matrix M and vector V.
+
+The tensor network contractions giving the elements of M and the expectation values
+entering V are done by Quimb, while the kernels in this module assemble M and V
+from the gathered results. The kernels replace the Python loops over the matrix
+element indices, Pauli strings and Hamiltonian coefficients in QuimbVqite, and
+are used when vqite_quimb.ENABLE_JIT is set. The compilation is cached on disk
+(cache=True) and done on the first call, such that its cost is amortized over
+the VQITE iterations.
+
+Notes:
+    Requires numba, see the jit optional dependencies in pyproject.toml.
+
+"""
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def fill_symmetric(ind: np.ndarray, values: np.ndarray, n: int) -> np.ndarray:
+    """Fill symmetric matrices from their elements at the given indices.
+
+    Parameters
+    ----------
+    ind : numpy.ndarray
+        (n_elements, 2) int64 array of the (mu, nu) indices of the elements.
+    values : numpy.ndarray
+        (n_matrices, n_elements) float64 array of the values of the elements of
+        each matrix.
+    n : int
+        Size of the matrices.
+
+    Returns
+    -------
+    numpy.ndarray
+        (n_matrices, n, n) float64 array of the symmetric matrices, where the
+        elements (mu, nu) and (nu, mu) are set to the given values and all other
+        elements are zero.
+
+    """
+    out = np.zeros((values.shape[0], n, n))
+    for i in prange(ind.shape[0]):
+        mu = ind[i, 0]
+        nu = ind[i, 1]
+        for k in range(values.shape[0]):
+            out[k, mu, nu] = values[k, i]
+            out[k, nu, mu] = values[k, i]
+    return out
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def assemble_v(exp_vals: np.ndarray, coefs: np.ndarray, n_params: int) -> np.ndarray:
+    """Assemble the vector V from the parameter-shifted Pauli expectation values.
+
+    Parameters
+    ----------
+    exp_vals : numpy.ndarray
+        (n_params * 2 * n_terms,) float64 array of the expectation values of the
+        Hamiltonian Pauli strings, ordered as in QuimbVqite.compute_v: for each
+        parameter, first with the parameter shifted by +pi/2, then by -pi/2.
+    coefs : numpy.ndarray
+        (n_terms,) float64 array of the Hamiltonian coefficients.
+    n_params : int
+        Number of parameters of the ansatz.
+
+    Returns
+    -------
+    numpy.ndarray
+        (n_params,) float64 array, the vector V.
+
+    """
+    n_terms = coefs.shape[0]
+    v = np.zeros(n_params)
+    for mu in prange(n_params):
+        h_plus = 0.0
+        h_minus = 0.0
+        for i in range(n_terms):
+            h_plus += exp_vals[2 * mu * n_terms + i] * coefs[i]
+            h_minus += exp_vals[(2 * mu + 1) * n_terms + i] * coefs[i]
+        v[mu] = -1 / 2 * (h_plus - h_minus) / 2
+    return v
@@ -20,9 +20,16 @@ Notes:
     See requirements.txt for complete dependency information and version requirements.
 """
 
+import hashlib
+import json
+import math
+import os
 import pickle
 import time
+from typing import Any
 
+import autoray as ar
+import cotengra as ctg
 import numpy as np
 import quimb as qu
 import quimb.tensor as qtn
@@ -36,6 +43,44 @@ except ImportError:
     # Fallback: Serial mode
     mpi_available = False
 
+try:
+    import kahypar  # noqa: F401
+
+    kahypar_available = True
+
+except ImportError:
+    # Fallback: hyper-optimized contraction paths are searched with greedy only
+    kahypar_available = False
+
+try:
+    import cupy
+
+    cupy_available = True
+
+except ImportError:
+    # Fallback: contractions on GPU are not supported
+    cupy_available = False
+
+try:
+    from vqite import _core_jit
+
+    numba_available = True
+
+except ImportError:
+    # Fallback: M and V are assembled in Python
+    numba_available = False
+
+# Whether M and V are assembled with the Numba-compiled kernels of _core_jit.
+ENABLE_JIT = False
+
+# Contraction path optimizers (see get_optimizer) whose search is randomized, such
+# that searching on several processes with different seeds finds better paths.
+SAMPLING_OPTIMIZERS = ("random-greedy", "hyper")
+
+# Integer encoding of single-qubit Pauli operators used by the binary ansatz format:
+# the Pauli PAULI_LABELS[k] is stored as the int8 value k.
+PAULI_LABELS = "IXYZ"
+
 
 class ModelH:
     """Class representing a quantum Hamiltonian model constructed from an incar_file.
@@ -60,7 +105,7 @@ class ModelH:
 
     """
 
-    def __init__(self, incar_file: str) -> None:
+    def __init__(self, incar_file: str, incar_content: str | None = None) -> None:
         """Initialize a ModelH instance.
 
         Parameters
@@ -68,6 +113,9 @@ class ModelH:
         incar_file : str
             Path to the input file in AVQITE format that specifies the Hamiltonian
             as a sum of Pauli string operators with coefficients.
+        incar_content : str or None, optional
+            Content of incar_file, if already read (e.g. broadcast from another
+            process). If None (default), incar_file is read.
 
         Returns
         -------
@@ -82,8 +130,9 @@ class ModelH:
 
         """
         self.incar_file = incar_file
-        with open(self.incar_file) as fp:
-            incar_content = fp.read()
+        if incar_content is None:
+            with open(self.incar_file) as fp:
+                incar_content = fp.read()
         h_pos = incar_content.find("h")
         pool_pos = incar_content.find("pool")
         h_string = incar_content[h_pos + 14 : pool_pos - 14]
@@ -119,12 +168,12 @@ class QuimbVqite:
         Path to file containing AVQITE-generated ansatz form
     _output_file : str
         Path where results will be written
-    _init_params : str or list
+    _init_params : str or list or ndarray
         Initial parameters for the ansatz. Can be:
         - 'random': Random perturbation around AVQITE solution
         - 'zeros': All zeros
         - 'avqite': Use AVQITE solution directly
-        - list: Custom parameter values
+        - list or ndarray: Custom parameter values
     _comm : MPI.COMM_WORLD
         MPI communicator for parallel execution
     _size : int
@@ -135,6 +184,9 @@ class QuimbVqite:
         Number of qubits in the system
     _ansatz : list[str]
         List of Pauli strings defining the ansatz form
+    _pauli_ops : ndarray
+        Read-only (n_ops, n_qubits) int8 array of the ansatz Pauli strings, see
+        encode_pauli_strings (with MPI, shared by the processes on a node)
     _params_solution : list[float]
         AVQITE-calculated parameters (fixed reference)
     params : list[float]
@@ -166,7 +218,8 @@ class QuimbVqite:
     -----
     - The implementation uses MPI for parallel computation of matrix elements.
     - Tensor network contractions are optimized using Quimb's contraction path finding.
-    - The ansatz file must be in AVQITE format (.pkle).
+    - The ansatz file must be in the binary format (.npy with a .json manifest, see
+      write_ansatz_npy) or in AVQITE format (.pkle).
     - The reference state must be specified as a string of '0's and '1's.
 
     See Also
@@ -181,7 +234,7 @@ class QuimbVqite:
         incar_file: str,
         ansatz_file: str,
         output_file: str,
-        init_params: str | list[float] = "random",
+        init_params: str | list[float] | np.ndarray = "random",
     ) -> None:
         """Initialize a QuimbVqite instance.
 
@@ -190,15 +243,21 @@ class QuimbVqite:
         incar_file : str
             Path to input file containing Hamiltonian and reference state specifications
         ansatz_file : str
-            Path to AVQITE format (.pkle) file containing ansatz form and parameters
+            Path to binary (.npy) or AVQITE format (.pkle) file containing ansatz
+            form and parameters
         output_file : str
             Path where calculation outputs will be written
-        init_params : str or list[float], optional
+        init_params : str or list[float] or np.ndarray, optional
             Initial parameter strategy, by default "random". Options:
             - "random": AVQITE parameters plus random noise in [-0.05, 0.05]
             - "zeros": All parameters set to 0.0
             - "avqite": Use parameters from AVQITE solution
-            - list: Custom parameter values matching ansatz length
+            - list or np.ndarray: Custom parameter values matching ansatz length
+
+        Notes
+        -----
+        With MPI, the initialization is collective, i.e. all processes have to
+        create the instance at the same time.
 
         Raises
         ------
@@ -221,37 +280,89 @@ class QuimbVqite:
             self._rank = 0
             self._size = 1
 
+        # Reads out the incar file. With MPI, only rank 0 reads the file, such
+        # that the other processes do no file I/O (the ansatz file is read once
+        # per node, see below).
+        incar_content = self.read_incar()
+
         # Reads out the Hamiltonian from the incar file.
-        self._H = ModelH(self._incar_file)
+        self._H = ModelH(self._incar_file, incar_content=incar_content)
         # The number of qubits is determined from there.
         self._num_qubits = len(self._H.paulis[0])
 
         # Reads out the form of the ansatz and the parameters of the ansatz from
         # the ansatz file.
-        # The ansatz file should be in the AVQITE format.
-        (self._ansatz, self._params_solution) = read_adaptvqite_ansatz(
-            self._ansatz_file
-        )
+        # The ansatz file should be either in the binary .npy format (preferred,
+        # memory-mapped) or in the AVQITE .pkle format.
+        # With MPI, the file is only read by one process per node, which places the
+        # Pauli strings (encoded as an int8 array) in a shared memory window read
+        # by the other processes on the node.
+        # Only rank 0 validates the binary file against its manifest.
+        if mpi_available:
+            self._node_comm = MPI.Intracomm(self._comm.Split_type(MPI.COMM_TYPE_SHARED))
+            (self._pauli_ops, self._params_solution, self._ansatz_win) = (
+                read_ansatz_shared(
+                    self._ansatz_file, self._node_comm, validate=self._rank == 0
+                )
+            )
+        else:
+            (ansatz, self._params_solution) = read_ansatz(self._ansatz_file)
+            self._pauli_ops = encode_pauli_strings(ansatz)
+        self._ansatz = decode_pauli_strings(self._pauli_ops)
         # For the purposes of VQITE, we might want to set the initial parameters
         # to be random.
-        if self._init_params == "random":
-            self.params = [
-                self._params_solution[i] + np.random.uniform(-0.05, 0.05)
-                for i in range(len(self._ansatz))
-            ]
-        elif self._init_params == "zeros":
-            self.params = [0.0 for _ in range(len(self._ansatz))]
-        elif self._init_params == "avqite":
-            self.params = self._params_solution.copy()
-        elif isinstance(self._init_params, list) and len(self._init_params) == len(
-            self._ansatz
-        ):
-            self.params = self._init_params.copy()
+        if isinstance(self._init_params, str):
+            if self._init_params == "random":
+                params_buf = np.array(
+                    [
+                        self._params_solution[i] + np.random.uniform(-0.05, 0.05)
+                        for i in range(len(self._ansatz))
+                    ],
+                    dtype=np.float64,
+                )
+                # The random parameters are broadcast from rank 0, such that all
+                # processes start from the same parameters.
+                if mpi_available:
+                    self._comm.Bcast([params_buf, MPI.DOUBLE], root=0)
+                self.params = [float(p) for p in params_buf]
+            elif self._init_params == "zeros":
+                self.params = [0.0 for _ in range(len(self._ansatz))]
+            elif self._init_params == "avqite":
+                self.params = self._params_solution.copy()
+            else:
+                raise NotImplementedError(
+                    "self._init_params has to be either random, zeros, avqite, "
+                    "or a list or ndarray of the ansatz length"
+                )
+        elif len(self._init_params) == len(self._ansatz):
+            self.params = [float(p) for p in self._init_params]
         else:
             raise NotImplementedError(
-                "self._init_params has to be either random, avqite, or a list"
+                "self._init_params has to be either random, zeros, avqite, "
+                "or a list or ndarray of the ansatz length"
             )
 
+        # Hash identifying the ansatz, used to validate cached contraction trees.
+        self._ansatz_hash = hashlib.sha1(
+            "\n".join(self._ansatz).encode(), usedforsecurity=False
+        ).hexdigest()
+        # Contraction trees for the tensor networks used in computing M and V,
+        # keyed by the structure of the tensor network (see tn_signature). The
+        # structure does not change between VQITE iterations, only the numerical
+        # values of the tensors do, such that the trees can be reused.
+        self._m_trees: dict[tuple, ctg.ContractionTree] = {}
+        self._v_trees: dict[tuple, ctg.ContractionTree] = {}
+        # Options used when creating contraction path optimizers (see get_optimizer).
+        self.optimizer_opts: dict = {}
+
+        # Buffers of the Allgatherv calls gathering M and V from all processes,
+        # with the corresponding persistent requests, keyed by name (see
+        # allgatherv).
+        self._gather_bufs: dict[
+            str,
+            tuple[tuple[int, ...], np.ndarray, np.ndarray, MPI.Prequest | None],
+        ] = {}
+
         # Matrix M and cvctor V used in VQITE.
         self._m = np.zeros((len(self._ansatz), len(self._ansatz)))
         self._m_width = np.zeros((len(self._ansatz), len(self._ansatz)))
@@ -259,9 +370,6 @@ class QuimbVqite:
 
         self._v = np.zeros(len(self._ansatz))
 
-        # Reads out the incar file.
-        with open(self._incar_file) as fp:
-            incar_content = fp.read()
         ref_st_r_pos = incar_content.find("ref_state")
 
         # Reads out the reference state from the incar file.
@@ -320,11 +428,105 @@ class QuimbVqite:
             self.circuit_2(mu) for mu in range(len(self._ansatz) + 1)
         ]
 
+    def read_incar(self) -> str:
+        """Read the incar file on rank 0 and broadcast its content.
+
+        This method is collective, i.e. it has to be called by all processes.
+
+        Returns
+        -------
+        str
+            Content of the incar file.
+
+        """
+        incar_content = ""
+        if self._rank == 0:
+            with open(self._incar_file) as fp:
+                incar_content = fp.read()
+        if mpi_available:
+            incar_content = self._comm.bcast(incar_content, root=0)
+        return incar_content
+
     def log(self, message: str) -> None:
-        """Log a message to the output file."""
+        """Log a message to the output file (no-op on ranks other than 0)."""
+        if self._rank != 0:
+            return
         with open(self._output_file, "a") as f:
             print(message, file=f)
 
+    def allgatherv(
+        self, name: str, sendbuf: np.ndarray, counts: tuple[int, ...]
+    ) -> np.ndarray:
+        """Gather arrays of different lengths from all processes.
+
+        The gathered arrays are concatenated in the order of the ranks. The send
+        and receive buffers are kept between calls with the same name and counts.
+        If MPI-4 persistent collectives are available, the Allgatherv is set up
+        once for these buffers and only restarted on subsequent calls, otherwise
+        a regular Allgatherv is used.
+
+        This method is collective, i.e. it has to be called by all processes.
+
+        Parameters
+        ----------
+        name : str
+            Name identifying the gathered quantity (e.g. "m" or "v").
+        sendbuf : numpy.ndarray
+            Array of floats to send from this process, of length counts[rank].
+        counts : tuple[int, ...]
+            Number of elements sent by each process.
+
+        Returns
+        -------
+        numpy.ndarray
+            Concatenation of the arrays sent by all processes.
+
+        See Also
+        --------
+        free_requests : Method for freeing the persistent requests
+
+        """
+        if not mpi_available:
+            return np.array(sendbuf, dtype=np.float64)
+        entry = self._gather_bufs.get(name)
+        if entry is None or entry[0] != counts:
+            if entry is not None and entry[3] is not None:
+                entry[3].Free()
+            send = np.zeros(counts[self._rank])
+            recv = np.zeros(sum(counts))
+            displacements = tuple([sum(counts[:i]) for i in range(self._size)])
+            request = None
+            if persistent_collectives_available(self._comm):
+                request = self._comm.Allgatherv_init(
+                    [send, MPI.DOUBLE], [recv, counts, displacements, MPI.DOUBLE]
+                )
+            entry = (counts, send, recv, request)
+            self._gather_bufs[name] = entry
+        counts, send, recv, request = entry
+        send[:] = sendbuf
+        if request is not None:
+            request.Start()
+            request.Wait()
+        else:
+            displacements = tuple([sum(counts[:i]) for i in range(self._size)])
+            self._comm.Allgatherv(
+                [send, MPI.DOUBLE], [recv, counts, displacements, MPI.DOUBLE]
+            )
+        return recv.copy()
+
+    def free_requests(self) -> None:
+        """Free the persistent requests and buffers created by allgatherv.
+
+        Returns
+        -------
+        None
+
+        """
+        for _, _, _, request in self._gather_bufs.values():
+            if request is not None:
+                request.Free()
+        self._gather_bufs = {}
+
     def update_params(self) -> None:
         """Update the circuit parameters to match the current values in self.params.
 
@@ -423,42 +625,38 @@ class QuimbVqite:
         start = sum(bins_sizes[: self._rank])
         end = start + bins_sizes[self._rank]
 
-        m_interm = np.zeros(end - start)
-        m_interm_cost = np.zeros(end - start)
-        m_interm_width = np.zeros(end - start)
-
-        m_nonzero = np.zeros(len(ind_list))
-        m_nonzero_cost = np.zeros(len(ind_list))
-        m_nonzero_width = np.zeros(len(ind_list))
+        # The values, widths and costs of the elements are gathered together,
+        # as rows of m_interm.
+        m_interm = np.zeros((end - start, 3))
 
+        # The expectation values <A_mu> entering the elements are computed once
+        # for each index mu.
+        contr2 = {
+            mu: self.contr2_est(mu=mu, **kwargs)[-1]
+            for mu in sorted({mu for pair in ind_list[start:end] for mu in pair})
+        }
         for i, (mu, nu) in enumerate(ind_list[start:end]):
             contr_mu_nu = self.contr1_est(mu=mu, nu=nu, **kwargs)
             m_interm[i] = (
-                contr_mu_nu[-1]
-                + self.contr2_est(mu=mu, **kwargs)[-1]
-                * self.contr2_est(mu=nu, **kwargs)[-1]
+                contr_mu_nu[-1] + contr2[mu] * contr2[nu],
+                contr_mu_nu[0],
+                contr_mu_nu[1],
             )
-            (m_interm_width[i], m_interm_cost[i]) = (contr_mu_nu[0], contr_mu_nu[1])
 
-        sendcountes = tuple(bins_sizes)
-        displacements = tuple([sum(bins_sizes[:i]) for i in range(self._size)])
-        if mpi_available:
-            self._comm.Allgatherv(
-                [m_interm, MPI.DOUBLE],
-                [m_nonzero, sendcountes, displacements, MPI.DOUBLE],
-            )
-            self._comm.Allgatherv(
-                [m_interm_cost, MPI.DOUBLE],
-                [m_nonzero_cost, sendcountes, displacements, MPI.DOUBLE],
-            )
-            self._comm.Allgatherv(
-                [m_interm_width, MPI.DOUBLE],
-                [m_nonzero_width, sendcountes, displacements, MPI.DOUBLE],
+        sendcountes = tuple(3 * bin_size for bin_size in bins_sizes)
+        m_nonzero_all = self.allgatherv("m", m_interm.ravel(), sendcountes).reshape(
+            len(ind_list), 3
+        )
+        m_nonzero = m_nonzero_all[:, 0]
+        m_nonzero_width = m_nonzero_all[:, 1]
+        m_nonzero_cost = m_nonzero_all[:, 2]
+        if jit_enabled():
+            (self._m, self._m_width, self._m_cost) = _core_jit.fill_symmetric(
+                np.array(ind_list, dtype=np.int64).reshape(len(ind_list), 2),
+                np.stack([m_nonzero, m_nonzero_width, m_nonzero_cost]),
+                len(self._ansatz),
             )
-        else:
-            m_nonzero = m_interm
-            m_nonzero_cost = m_interm_cost
-            m_nonzero_width = m_interm_width
+            return
         self._m = np.zeros((len(self._ansatz), len(self._ansatz)))
         for i in range(len(ind_list)):
             self._m[ind_list[i]] = m_nonzero[i]
@@ -484,7 +682,9 @@ class QuimbVqite:
         ----------
         optimize : str or dict
             Specifies the optimization strategy for tensor network contractions:
-            - If str: Uses Quimb's built-in optimization method (e.g. "greedy")
+            - If str: Uses Quimb's built-in optimization method (e.g. "greedy"),
+              the found contraction trees are cached and reused (see
+              contract_cached)
             - If dict: Uses pre-computed contraction paths for each Pauli string
         **kwargs : dict
             Additional arguments for Quimb's tensor network operations:
@@ -506,8 +706,6 @@ class QuimbVqite:
         """
         n_of_exp_vals = len(self.params) * 2 * len(self._H.paulis)
 
-        self._exp_vals = np.zeros(n_of_exp_vals)
-
         bins_sizes = [int(n_of_exp_vals / self._size) for _ in range(self._size)]
         for i in range(n_of_exp_vals - int(n_of_exp_vals / self._size) * self._size):
             bins_sizes[i] = bins_sizes[i] + 1
@@ -550,7 +748,7 @@ class QuimbVqite:
                 )
             else:
                 exp_vals_iterm[i] = np.real(
-                    p_str_exp_eval(
+                    self.p_str_exp_eval_cached(
                         qc=qc,
                         pauli_str=pauli_str,
                         optimize=optimize,
@@ -559,15 +757,15 @@ class QuimbVqite:
                 )
 
         sendcountes = tuple(bins_sizes)
-        displacements = tuple([sum(bins_sizes[:i]) for i in range(self._size)])
         # collecting an array of the expectation values for all Pauli strings
-        if mpi_available:
-            self._comm.Allgatherv(
-                [exp_vals_iterm, MPI.DOUBLE],
-                [self._exp_vals, sendcountes, displacements, MPI.DOUBLE],
+        self._exp_vals = self.allgatherv("v", exp_vals_iterm, sendcountes)
+        if jit_enabled():
+            self._v = _core_jit.assemble_v(
+                self._exp_vals,
+                np.array(self._H.coefs, dtype=np.float64),
+                len(self.params),
             )
-        else:
-            self._exp_vals = exp_vals_iterm
+            return
         # computing Hamiltonian expectation values for different parameters
         h_exp_vals = [
             sum(
@@ -619,8 +817,10 @@ class QuimbVqite:
         self,
         delta: float = 1e-4,
         dt: float = 0.02,
-        optimize_m: str = "greedy",
-        optimize_v: str = "greedy",
+        optimize_m: str = "hyper",
+        optimize_v: str = "hyper",
+        path_cache: str | None = None,
+        optimizer_opts: dict | None = None,
         **kwargs: str | int | float | bool,
     ) -> None:
         """Perform VQITE routine.
@@ -633,10 +833,22 @@ class QuimbVqite:
             Imaginary time step.
         optimize_m : string
             Optimizer to use when looking for contraction paths for M matrix.
+            Besides the optimizers known to Quimb, "hyper" is supported, see
+            get_optimizer. By default "hyper".
         optimize_v : string or dict[cotengra.core.ContractionTree]
             Optimizer to use when looking for contraction paths for V vector.
             If dict, then entries should correspond to a contraction tree for
             each Pauli in the Hamiltonian (this is to reuse contraction paths).
+            If string, the trees for the Hamiltonian terms are searched once on
+            rank 0 before the first iteration (see search_v_trees). By default
+            "hyper".
+        path_cache : str or None
+            Path to a JSON file caching the contraction trees between runs. If the file
+            exists, the trees are loaded from it before the first iteration. The
+            trees are saved to it after the first iteration.
+        optimizer_opts : dict or None
+            Options used when creating contraction path optimizers, passed to
+            get_optimizer (e.g. {"max_time": 10.0}).
         **kwargs
             Arguments used in Quimb methods for tensor contraction
             evaluations, such as (note that optimize parameter is specified
@@ -646,70 +858,509 @@ class QuimbVqite:
                 backend : str
                     Backend to use when performing the contractions.
                     Usually specified if GPU acceleration is needed.
+                dtype : str
+                    Data type of the tensors, "complex128" (default) or
+                    "complex64". With "complex64", the contractions switch to
+                    "complex128" as soon as the energy increases in an iteration
+                    (see precision_lost).
                 ...
 
         """
         _iter: int = 0
-        if self._rank == 0:
-            self.log("Starting VQITE calculation...")
+        if optimizer_opts is not None:
+            self.optimizer_opts = dict(optimizer_opts)
+        self.setup_backend(kwargs.get("backend"))
+        self.load_contraction_trees(path_cache)
+        if isinstance(optimize_v, str):
+            self.search_v_trees(optimize=optimize_v, **kwargs)
+        self.log("Starting VQITE calculation...")
         while True:
-            if mpi_available:
-                t1: float = MPI.Wtime()
-            else:
-                t1: float = time.time()
+            t1 = wall_time()
             if _iter == 0:
                 # For the first iteration, need to compute the entire matrix
                 # since it is not known a priori which elements are zero.
                 self.compute_m(optimize=optimize_m, which_nonzero=None, **kwargs)
                 # Save locations of nonzero elements.
-                non_zero_els = np.where(np.abs(self._m) > 1e-14)
-                self.which_nonzero = [
-                    (non_zero_els[0][i], non_zero_els[1][i])
-                    for i in range(len(non_zero_els[0]))
-                    if non_zero_els[0][i] <= non_zero_els[1][i]
-                ]
-                if self._rank == 0:
-                    self.log(f"# of nonzero elements of M: {len(self.which_nonzero)}")
+                self.which_nonzero = self.m_nonzero_indices()
+                self.log(f"# of nonzero elements of M: {len(self.which_nonzero)}")
             else:
                 # For iterations after the first one, need to compute only
                 # nonzero elements
                 self.compute_m(
                     optimize=optimize_m, which_nonzero=self.which_nonzero, **kwargs
                 )
-            if mpi_available:
-                t2: float = MPI.Wtime()
-            else:
-                t2: float = time.time()
+            t2 = wall_time()
             self.compute_v(optimize=optimize_v, **kwargs)
-            if mpi_available:
-                t3: float = MPI.Wtime()
-            else:
-                t3: float = time.time()
+            t3 = wall_time()
             dthdt: np.ndarray = self.get_dthdt(delta=delta, m=self._m, v=self._v)
+            params_old = self.params
             params_new = [
                 p + pp * dt for p, pp in zip(self.params, dthdt, strict=False)
             ]
             self.params = params_new
             self.update_params()
+            e_old: complex | None = getattr(self, "_e", None)
             self._e: complex = self.h_exp_val(
                 params=self.params, optimize=optimize_v, **kwargs
             )
-            if self._rank == 0:
-                self.log(
-                    f"iter: "
-                    f"{_iter}"
-                    f", M matrix time: "
-                    f"{t2 - t1}"
-                    f", V vector time: "
-                    f"{t3 - t2}"
-                    f", Energy: "
-                    f"{self._e}"
-                )
+            if self.precision_lost(e_old, **kwargs):
+                # The energy has to decrease in imaginary time evolution, the
+                # iteration is repeated in double precision.
+                kwargs["dtype"] = "complex128"
+                self.params = params_old
+                self.update_params()
+                continue
+            self.log(
+                f"iter: "
+                f"{_iter}"
+                f", M matrix time: "
+                f"{t2 - t1}"
+                f", V vector time: "
+                f"{t3 - t2}"
+                f", Energy: "
+                f"{self._e}"
+            )
+            if _iter == 0:
+                # Each M tree has been searched by one process only, the trees are
+                # shared such that no process searches them again.
+                self.share_contraction_trees()
+                self.save_contraction_trees(path_cache)
             self._vmax: float = np.max(np.abs(self._v))
             # Convergence condition.
             if self._vmax < 1e-4:
                 break
             _iter += 1
+        self.free_requests()
+
+    def m_nonzero_indices(self) -> list[tuple[int, int]]:
+        """Find the nonzero elements of the upper triangle of the matrix M.
+
+        Returns
+        -------
+        list[tuple[int, int]]
+            Indices (mu, nu), mu <= nu, of the elements of self._m with absolute
+            value larger than 1e-14.
+
+        """
+        non_zero_els = np.where(np.abs(self._m) > 1e-14)
+        return [
+            (non_zero_els[0][i], non_zero_els[1][i])
+            for i in range(len(non_zero_els[0]))
+            if non_zero_els[0][i] <= non_zero_els[1][i]
+        ]
+
+    def precision_lost(
+        self, e_old: complex | None, **kwargs: str | int | float | bool
+    ) -> bool:
+        """Check whether single precision contractions have become too inaccurate.
+
+        In imaginary time evolution the energy decreases in each iteration. If
+        the contractions are performed in single precision (dtype "complex64")
+        and the energy increased, the rounding errors dominate the change of the
+        energy.
+
+        Parameters
+        ----------
+        e_old : complex or None
+            Energy of the previous iteration, None in the first iteration.
+        **kwargs : dict
+            Arguments used in Quimb methods for tensor contraction evaluations,
+            the precision is given by dtype.
+
+        Returns
+        -------
+        bool
+            Whether the contractions were performed in single precision and the
+            energy self._e increased compared to e_old.
+
+        """
+        if kwargs.get("dtype") != "complex64" or e_old is None:
+            return False
+        if np.real(self._e) <= np.real(e_old):
+            return False
+        self.log(
+            f"Energy increased from {e_old} to {self._e} with complex64, "
+            "switching to complex128"
+        )
+        return True
+
+    def setup_backend(self, backend: str | int | float | bool | None) -> None:
+        """Prepare the array backend used for the contractions.
+
+        For the cupy backend, each process is bound to a GPU of its node (see
+        use_local_gpu). For backends other than numpy, a small contraction is
+        performed first, such that the one-time initialization of the backend
+        (e.g. creating the GPU context and libraries' handles) is not included in
+        the time of the first VQITE iteration.
+
+        Parameters
+        ----------
+        backend : str or None
+            Array backend used for the contractions, e.g. "numpy", "cupy" or "jax".
+
+        """
+        if backend is None or backend == "numpy":
+            return
+        if backend == "cupy":
+            local_rank = self._node_comm.Get_rank() if mpi_available else 0
+            use_local_gpu(local_rank)
+        tn = qtn.TensorNetwork(
+            [
+                qtn.Tensor(np.eye(2, dtype=complex), inds=("a", "b")),
+                qtn.Tensor(np.eye(2, dtype=complex), inds=("b", "a")),
+            ]
+        )
+        contract_on_backend(tn, optimize="greedy", backend=str(backend))
+
+    def contract_cached(
+        self,
+        tn: qtn.TensorNetwork,
+        trees: dict[tuple, ctg.ContractionTree],
+        optimize: str | ctg.PathOptimizer = "auto-hq",
+        backend: str | None = None,
+    ) -> tuple[float, float, complex]:
+        """Fully contract a tensor network reusing cached contraction trees.
+
+        The contraction tree is looked up in trees by the structure of the tensor
+        network (see tn_signature). Only if no tree is found, a new one is
+        searched for using optimize (resolved with get_optimizer and the options
+        in self.optimizer_opts) and added to trees.
+
+        Parameters
+        ----------
+        tn : quimb.tensor.TensorNetwork
+            Tensor network to contract.
+        trees : dict[tuple, cotengra.ContractionTree]
+            Cache of contraction trees, e.g. self._m_trees or self._v_trees.
+        optimize : str or cotengra.PathOptimizer, optional
+            Contraction path optimizer used if no cached tree is available,
+            by default "auto-hq".
+        backend : str, optional
+            Backend to use when performing the contraction.
+
+        Returns
+        -------
+        width : float
+            Contraction width - logarithm of maximum intermediate tensor size
+        cost : float
+            Contraction cost - logarithm of total number of operations
+        contraction : complex
+            Numerical value of the contracted tensor network
+
+        """
+        key = tn_signature(tn)
+        tree = trees.get(key)
+        if tree is None:
+            optimizer = get_optimizer(optimize, **self.optimizer_opts)
+            tree = tn.contraction_tree(optimize=optimizer, output_inds=())
+            trees[key] = tree
+        contraction = contract_on_backend(tn, optimize=tree, backend=backend)
+        width = tree.contraction_width()
+        cost = math.log10(max(tree.contraction_cost(), 1))
+        return width, cost, contraction
+
+    def p_str_exp_eval_cached(
+        self,
+        qc: qtn.Circuit,
+        pauli_str: str,
+        optimize: str | ctg.PathOptimizer = "auto-hq",
+        backend: str | None = None,
+        **kwargs: str | int | float | bool,
+    ) -> complex:
+        """Evaluate the expectation value of a Pauli string reusing cached trees.
+
+        Same as p_str_exp_eval, but the contraction trees are cached in
+        self._v_trees and reused for tensor networks of the same structure.
+
+        Parameters
+        ----------
+        qc : quimb.tensor.circuit.Circuit
+            Quantum circuit representing a state for which the expectation value
+            is computed.
+        pauli_str : str
+            Pauli string representing an observable.
+        optimize : str or cotengra.PathOptimizer, optional
+            Optimizer to use when no cached contraction tree is available.
+        backend : str, optional
+            Backend to use when performing the contraction.
+        **kwargs : dict
+            Arguments for Quimb tensor network construction, such as
+            simplify_sequence.
+
+        Returns
+        -------
+        exp_val : complex
+            Expectation value of the Pauli string.
+
+        """
+        tn = p_str_exp_tn(qc=qc, pauli_str=pauli_str, **kwargs)
+        return self.contract_cached(
+            tn, self._v_trees, optimize=optimize, backend=backend
+        )[-1]
+
+    def search_v_trees(
+        self,
+        optimize: str | ctg.PathOptimizer = "auto-hq",
+        **kwargs: str | int | float | bool,
+    ) -> None:
+        """Search contraction trees for the Hamiltonian terms once for all processes.
+
+        The structure of the tensor networks evaluating the expectation values of
+        the Hamiltonian terms does not depend on the parameters, such that the
+        same trees are used in compute_v and h_exp_val throughout VQITE. The trees
+        not yet in self._v_trees are searched once for all processes:
+
+        - Sampling optimizers (see SAMPLING_OPTIMIZERS) search on every process,
+          with the rank as the seed. For each tensor network, the process which
+          found the tree of lowest cost is determined with an MPI_MINLOC
+          reduction and broadcasts it to all other processes.
+        - Other optimizers are deterministic, rank 0 searches the trees and
+          broadcasts them.
+
+        This method is collective, i.e. it has to be called by all processes.
+
+        Parameters
+        ----------
+        optimize : str or cotengra.PathOptimizer, optional
+            Contraction path optimizer, resolved with get_optimizer and the
+            options in self.optimizer_opts, by default "auto-hq".
+        **kwargs : dict
+            Arguments for Quimb tensor network construction, such as
+            simplify_sequence.
+
+        """
+        sampling = (
+            mpi_available
+            and isinstance(optimize, str)
+            and optimize in SAMPLING_OPTIMIZERS
+        )
+        found: dict[tuple, ctg.ContractionTree] = {}
+        if sampling or self._rank == 0:
+            qc = self._base_circuits[-1]
+            for pauli_str in self._H.paulis:
+                tn = p_str_exp_tn(qc=qc, pauli_str=pauli_str, **kwargs)
+                key = tn_signature(tn)
+                if key in self._v_trees or key in found:
+                    continue
+                optimizer = get_optimizer(
+                    optimize, seed=self._rank, **self.optimizer_opts
+                )
+                found[key] = tn.contraction_tree(optimize=optimizer, output_inds=())
+        if not sampling:
+            paths = {key: tree.get_ssa_path() for key, tree in found.items()}
+            self.bcast_contraction_trees({"m": {}, "v": paths})
+            return
+        # All processes have searched the same tensor networks in the same order.
+        for key, tree in found.items():
+            _, winner = self._comm.allreduce(
+                (tree.contraction_cost(), self._rank), op=MPI.MINLOC
+            )
+            best = self.bcast_paths(
+                {"m": {}, "v": {key: tree.get_ssa_path()}}, root=winner
+            )
+            self._v_trees[key] = tree_from_signature(key, best["v"][key])
+
+    def share_contraction_trees(self) -> None:
+        """Make the contraction trees found by any process available to all.
+
+        The contraction paths cached by all processes are gathered and merged on
+        rank 0, which broadcasts them back to all processes.
+
+        This method is collective, i.e. it has to be called by all processes.
+
+        """
+        if not mpi_available:
+            return
+        paths = {
+            name: {key: tree.get_ssa_path() for key, tree in trees.items()}
+            for name, trees in (("m", self._m_trees), ("v", self._v_trees))
+        }
+        # The paths are gathered on rank 0 as flat int32 buffers (see
+        # encode_contraction_paths).
+        sendbuf = encode_contraction_paths(paths)
+        counts = np.zeros(self._size, dtype=np.int64)
+        self._comm.Gather(
+            [np.array([sendbuf.size], dtype=np.int64), MPI.INT64_T],
+            [counts, MPI.INT64_T],
+            root=0,
+        )
+        recvbuf = np.empty(int(counts.sum()) if self._rank == 0 else 0, np.int32)
+        self._comm.Gatherv(
+            [sendbuf, MPI.INT32_T], [recvbuf, (counts, None), MPI.INT32_T], root=0
+        )
+        merged: dict[str, dict] = {"m": {}, "v": {}}
+        if self._rank == 0:
+            for rank_buf in np.split(recvbuf, np.cumsum(counts)[:-1]):
+                rank_paths = decode_contraction_paths(rank_buf)
+                merged["m"].update(rank_paths["m"])
+                merged["v"].update(rank_paths["v"])
+        self.bcast_contraction_trees(merged)
+
+    def bcast_contraction_trees(self, paths: dict[str, dict]) -> None:
+        """Broadcast contraction paths from rank 0 and add them to the caches.
+
+        This method is collective, i.e. it has to be called by all processes.
+
+        Parameters
+        ----------
+        paths : dict[str, dict]
+            Contraction paths on rank 0, {"m": {signature: ssa_path}, "v": {...}},
+            added to self._m_trees and self._v_trees respectively. Ignored on the
+            other ranks.
+
+        """
+        paths = self.bcast_paths(paths, root=0)
+        for name, trees in (("m", self._m_trees), ("v", self._v_trees)):
+            for key, ssa_path in paths[name].items():
+                if key not in trees:
+                    trees[key] = tree_from_signature(key, ssa_path)
+
+    def bcast_paths(self, paths: dict[str, dict], root: int = 0) -> dict[str, dict]:
+        """Broadcast contraction paths from one process to all others.
+
+        The paths are broadcast as a flat int32 buffer (see
+        encode_contraction_paths) using the buffer interface of MPI, first the
+        length of the buffer, then the buffer itself.
+
+        This method is collective, i.e. it has to be called by all processes.
+
+        Parameters
+        ----------
+        paths : dict[str, dict]
+            Contraction paths on the root process, {"m": {signature: ssa_path},
+            "v": {...}}. Ignored on the other processes.
+        root : int, default=0
+            Rank of the process broadcasting the paths.
+
+        Returns
+        -------
+        dict[str, dict]
+            The contraction paths of the root process.
+
+        """
+        if not mpi_available:
+            return paths
+        buf = np.zeros(0, dtype=np.int32)
+        if self._rank == root:
+            buf = encode_contraction_paths(paths)
+        length = np.array(buf.size, dtype=np.int64)
+        self._comm.Bcast([length, MPI.INT64_T], root=root)
+        if self._rank != root:
+            buf = np.empty(int(length), dtype=np.int32)
+        self._comm.Bcast([buf, MPI.INT32_T], root=root)
+        if self._rank == root:
+            return paths
+        return decode_contraction_paths(buf)
+
+    def path_cache_key(
+        self,
+        optimize_m: str | dict,
+        optimize_v: str | dict,
+        simplify_sequence: str = "ADCRS",
+    ) -> str:
+        """Compute a key identifying the contraction trees of a VQITE run.
+
+        The key is a SHA-1 hash of everything the tensor networks of M and V and
+        the found contraction trees depend on: the ansatz Pauli strings, the
+        Hamiltonian Pauli strings, the reference state, the optimizers and the
+        simplification sequence. It can be used to name files caching the
+        contraction trees between runs (see save_contraction_trees), which are
+        then reused by runs with, e.g., different initial parameters.
+
+        Parameters
+        ----------
+        optimize_m : str or dict
+            Optimizer used for the contraction trees of M (see vqite).
+        optimize_v : str or dict
+            Optimizer used for the contraction trees of V (see vqite).
+        simplify_sequence : str, default="ADCRS"
+            Tensor network simplifications applied before the contractions.
+
+        Returns
+        -------
+        str
+            Hexadecimal SHA-1 hash.
+
+        """
+        key = hashlib.sha1(usedforsecurity=False)
+        key.update(self._pauli_ops.tobytes())
+        key.update("\n".join(self._H.paulis).encode())
+        key.update(
+            f"{self._ref_state}\n{optimize_m}\n{optimize_v}\n{simplify_sequence}".encode()
+        )
+        return key.hexdigest()
+
+    def save_contraction_trees(self, filename: str | None) -> None:
+        """Save the cached contraction trees to a file.
+
+        Rank 0 writes its trees to a JSON file together with the hash of the
+        ansatz, the other processes do nothing. Only the signatures of the tensor
+        networks and the contraction paths are stored, the trees are rebuilt from
+        them when loading. To include the trees found by the other processes,
+        share_contraction_trees has to be called first.
+
+        Parameters
+        ----------
+        filename : str or None
+            Path to the JSON file to write the contraction trees to. If None,
+            nothing is saved.
+
+        See Also
+        --------
+        load_contraction_trees : Method for loading the saved contraction trees
+
+        """
+        if filename is None or self._rank != 0:
+            return
+        data: dict[str, Any] = {
+            "ansatz_hash": self._ansatz_hash,
+            "m": [(key, tree.get_ssa_path()) for key, tree in self._m_trees.items()],
+            "v": [(key, tree.get_ssa_path()) for key, tree in self._v_trees.items()],
+        }
+        with open(filename, "w") as out:
+            json.dump(data, out)
+
+    def load_contraction_trees(self, filename: str | None) -> bool:
+        """Load contraction trees saved by save_contraction_trees.
+
+        Rank 0 reads the file and broadcasts the contraction paths to all other
+        processes. The trees are only used if they were saved for the same
+        ansatz.
+
+        This method is collective, i.e. it has to be called by all processes.
+
+        Parameters
+        ----------
+        filename : str or None
+            Path to the JSON file containing the contraction trees. If None or if
+            the file does not exist, nothing is loaded.
+
+        Returns
+        -------
+        bool
+            Whether the contraction trees were loaded.
+
+        """
+        if filename is None:
+            return False
+        paths: dict[str, dict] | None = None
+        if self._rank == 0 and os.path.exists(filename):
+            with open(filename) as inp:
+                data = json.load(inp)
+            if data.get("ansatz_hash") == self._ansatz_hash:
+                # JSON stores tuples as lists, the signatures are tuples again.
+                paths = {
+                    name: {as_tuple(key): as_tuple(path) for key, path in data[name]}
+                    for name in ("m", "v")
+                }
+        loaded = paths is not None
+        if mpi_available:
+            loaded = self._comm.bcast(loaded, root=0)
+        if not loaded:
+            return False
+        self.bcast_contraction_trees(paths or {"m": {}, "v": {}})
+        self.log(f"Loaded contraction trees from {filename}")
+        return True
 
     def h_terms_find_contractions(self, **kwargs: str | int | float | bool) -> None:
         """Find tensor network contractions for Hamiltonian term expectation values.
@@ -756,7 +1407,8 @@ class QuimbVqite:
             If None, uses the current parameters stored in the object.
         optimize : str or dict
             Specifies how to optimize the tensor network contractions:
-            - If str: Uses Quimb's built-in optimizer (e.g. "greedy", "dynamic", etc.)
+            - If str: Uses Quimb's built-in optimizer (e.g. "greedy", "dynamic", etc.),
+              the found contraction trees are cached and reused
             - If dict: Maps each Pauli string to a pre-computed optimal contraction tree
         **kwargs : dict
             Additional arguments passed to Quimb's contraction methods, including:
@@ -795,7 +1447,7 @@ class QuimbVqite:
                 h_exp_vals.append(exp_val)
             else:
                 h_exp_vals.append(
-                    p_str_exp_eval(
+                    self.p_str_exp_eval_cached(
                         qc=qc, pauli_str=pauli_str, optimize=optimize, **kwargs
                     )
                 )
@@ -891,6 +1543,7 @@ class QuimbVqite:
         self,
         mu: int,
         nu: int,
+        optimize: str | ctg.PathOptimizer = "auto-hq",
         backend: str | None = None,
         **kwargs: str | int | float | bool,
     ) -> tuple[float, float, complex]:
@@ -901,7 +1554,9 @@ class QuimbVqite:
 
         This overlap term appears in the calculation of matrix elements for the VQITE
         algorithm. The calculation involves constructing a tensor network representing
-        the circuit and finding an optimal contraction sequence.
+        the circuit and finding an optimal contraction sequence. The contraction
+        tree is cached and reused for tensor networks of the same structure (see
+        contract_cached).
 
         Parameters
         ----------
@@ -911,14 +1566,15 @@ class QuimbVqite:
         nu : int
             Index \nu specifying the position of the second Pauli operator A_{\nu}.
             Must satisfy \mu ≤ \nu < len(ansatz).
+        optimize : str or cotengra.PathOptimizer, optional
+            Contraction path optimizer (e.g. "greedy", "optimal") used when no
+            cached contraction tree is available, by default "auto-hq".
         **kwargs : dict
-            Additional arguments for tensor network contraction, including:
-            - optimize : str
-                Contraction path optimizer (e.g. "greedy", "optimal")
+            Additional arguments for tensor network construction, including:
             - simplify_sequence : str
                 Sequence of tensor network simplifications
-            - memory_limit : int
-                Maximum intermediate tensor size in bytes
+            - dtype : str
+                Data type of the tensors
         backend : str, optional
             Hardware backend for tensor contractions. Options include:
             - "numpy" : CPU-based calculations (default)
@@ -948,10 +1604,9 @@ class QuimbVqite:
             raise ValueError("it is assumed here that mu<=nu")
         if mu < nu:
             qc = self.circuit_1(mu, nu, a_mu=self._ansatz[mu], a_nu=self._ansatz[nu])
-            reh = qc.amplitude_rehearse("0" * self._num_qubits, **kwargs)
-            width, cost = reh["W"], reh["C"]
-            contraction = reh["tn"].contract(
-                all, optimize=reh["tree"], output_inds=(), backend=backend
+            tn = qc.amplitude_tn("0" * self._num_qubits, **kwargs)
+            width, cost, contraction = self.contract_cached(
+                tn, self._m_trees, optimize=optimize, backend=backend
             )
         if mu == nu:
             width, cost, contraction = (1, 0, 1)
@@ -959,7 +1614,11 @@ class QuimbVqite:
         return width, cost, contraction
 
     def contr2_est(
-        self, mu: int, backend: str | None = None, **kwargs: str | int | float | bool
+        self,
+        mu: int,
+        optimize: str | ctg.PathOptimizer = "auto-hq",
+        backend: str | None = None,
+        **kwargs: str | int | float | bool,
     ) -> tuple[float, float, complex]:
         r"""Calculate tensor network contraction metrics for a specific VQITE term.
 
@@ -975,18 +1634,19 @@ class QuimbVqite:
         ----------
         mu : int
             Index of the Pauli operator A_{\mu} from the ansatz to evaluate
+        optimize : str or cotengra.PathOptimizer, optional
+            Contraction path optimizer (e.g. "greedy", "optimal") used when no
+            cached contraction tree is available, by default "auto-hq".
+        backend : str, optional
+            Hardware backend for tensor contractions:
+            - "numpy" : CPU-based calculations (default)
+            - "cupy" : GPU-accelerated calculations
         **kwargs : dict
-            Additional arguments for tensor network contraction:
-            optimize : str
-                Contraction path optimizer (e.g. "greedy", "optimal")
+            Additional arguments for tensor network construction:
             simplify_sequence : str
                 Sequence of tensor network simplifications (e.g. "ADCRS")
-            memory_limit : int
-                Maximum intermediate tensor size in bytes
-            backend : str, optional
-                Hardware backend for tensor contractions:
-                - "numpy" : CPU-based calculations (default)
-                - "cupy" : GPU-accelerated calculations
+            dtype : str
+                Data type of the tensors
 
         Returns
         -------
@@ -1010,12 +1670,12 @@ class QuimbVqite:
                 "mu has to be smaller than the number of operators in the ansatz"
             )
         qc = self._base_circuits[mu]
-        reh = p_str_exp_contr_path(qc=qc, pauli_str=self._ansatz[mu], **kwargs)
-        contraction = reh["tn"].contract(
-            all, optimize=reh["tree"], output_inds=(), backend=backend
+        tn = p_str_exp_tn(qc=qc, pauli_str=self._ansatz[mu], **kwargs)
+        width, cost, contraction = self.contract_cached(
+            tn, self._m_trees, optimize=optimize, backend=backend
         )
         contraction = np.real(1j * contraction / 2)
-        return reh["W"], reh["C"], contraction
+        return width, cost, contraction
 
 
 def add_pauli_rotation_gate(
@@ -1187,6 +1847,249 @@ def read_adaptvqite_ansatz(filename: str) -> tuple[list[str], list[float]]:
     return ansatz_adaptvqite, params_adaptvqite
 
 
+def read_ansatz(filename: str, validate: bool = True) -> tuple[list[str], list[float]]:
+    """Read ansatz from a file in either the binary or the AVQITE format.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the ansatz file. Files ending with .npy are read with
+        read_ansatz_npy, files ending with .pkle with read_adaptvqite_ansatz.
+    validate : bool, default=True
+        Whether to validate a binary ansatz file against its manifest.
+
+    Returns
+    -------
+    ansatz : list[str]
+        List of Pauli strings defining the variational ansatz.
+    params : list[float]
+        List of variational parameters corresponding to each Pauli string.
+
+    Raises
+    ------
+    ImportError
+        If the provided filename has neither a .npy nor a .pkle extension.
+
+    """
+    if filename.endswith(".npy"):
+        return read_ansatz_npy(filename, validate=validate)
+    if filename.endswith(".pkle"):
+        return read_adaptvqite_ansatz(filename)
+    raise ImportError("Ansatz file should be given in .npy or .pkle format")
+
+
+def read_ansatz_npy(
+    filename: str, validate: bool = True
+) -> tuple[list[str], list[float]]:
+    """Read ansatz stored in the binary format.
+
+    The Pauli strings of the ansatz are stored in a .npy file as an
+    (n_ops, n_qubits) int8 array, with the Pauli PAULI_LABELS[k] encoded as k.
+    The array is memory-mapped and decoded into Pauli strings, no unpickling is
+    involved. The parameters and metadata are stored in a JSON manifest next to it
+    (same name, .json extension).
+
+    Parameters
+    ----------
+    filename : str
+        Path to the .npy file containing the Pauli strings of the ansatz.
+    validate : bool, default=True
+        Whether to check the array and the Pauli encoding against the manifest.
+        It is sufficient to do this on a single process. Invalid Pauli operator
+        codes are detected in either case.
+
+    Returns
+    -------
+    ansatz : list[str]
+        List of Pauli strings defining the variational ansatz.
+    params : list[float]
+        List of variational parameters corresponding to each Pauli string.
+
+    Raises
+    ------
+    ValueError
+        If validate is True and the array or the Pauli encoding does not match
+        the manifest, or if the array contains invalid Pauli operator codes.
+
+    See Also
+    --------
+    write_ansatz_npy : Function for writing an ansatz in the binary format
+
+    """
+    with open(os.path.splitext(filename)[0] + ".json") as fp:
+        manifest = json.load(fp)
+    pauli_ops = np.load(filename, mmap_mode="r", allow_pickle=False)
+
+    if validate:
+        if pauli_ops.dtype != np.int8 or pauli_ops.shape != (
+            manifest["num_ops"],
+            manifest["num_qubits"],
+        ):
+            raise ValueError(
+                f"Ansatz array in {filename} does not match its manifest: "
+                f"got {pauli_ops.dtype} array of shape {pauli_ops.shape}"
+            )
+        if len(manifest["params"]) != manifest["num_ops"]:
+            raise ValueError("Number of parameters does not match the ansatz length")
+        if manifest.get("pauli_labels") != PAULI_LABELS:
+            raise ValueError(
+                f"Ansatz file {filename} uses the Pauli encoding "
+                f"{manifest.get('pauli_labels')!r}, expected {PAULI_LABELS!r}"
+            )
+
+    ansatz = decode_pauli_strings(pauli_ops)
+    params = [float(p) for p in manifest["params"]]
+    return ansatz, params
+
+
+def read_ansatz_shared(
+    filename: str, node_comm: "MPI.Intracomm", validate: bool = True
+) -> tuple[np.ndarray, list[float], "MPI.Win"]:
+    """Read ansatz once per node into MPI shared memory.
+
+    The process of rank 0 in node_comm reads the ansatz file (see read_ansatz) and
+    places the Pauli strings, encoded with encode_pauli_strings, in a shared
+    memory window. The other processes in node_comm do not access the file, they
+    get a read-only view of the window. The parameters are broadcast.
+
+    This function is collective over node_comm.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the ansatz file in the binary (.npy) or AVQITE (.pkle) format.
+    node_comm : MPI.Intracomm
+        Communicator of the processes sharing memory, e.g. obtained with
+        comm.Split_type(MPI.COMM_TYPE_SHARED).
+    validate : bool, default=True
+        Whether to validate a binary ansatz file against its manifest (only used
+        on rank 0 of node_comm).
+
+    Returns
+    -------
+    pauli_ops : numpy.ndarray
+        Read-only (n_ops, n_qubits) int8 array of the Pauli strings, a view of
+        the shared memory window.
+    params : list[float]
+        List of variational parameters corresponding to each Pauli string.
+    win : MPI.Win
+        Shared memory window, which has to be kept alive while pauli_ops is used.
+
+    """
+    pauli_ops = np.zeros((0, 0), dtype=np.int8)
+    params: list[float] = []
+    if node_comm.Get_rank() == 0:
+        (ansatz, params) = read_ansatz(filename, validate=validate)
+        pauli_ops = encode_pauli_strings(ansatz)
+    (shape, params) = node_comm.bcast((pauli_ops.shape, params), root=0)
+    win = MPI.Win.Allocate_shared(pauli_ops.nbytes, 1, comm=node_comm)
+    buf, _ = win.Shared_query(0)
+    shared = np.frombuffer(buf, dtype=np.int8, count=shape[0] * shape[1])
+    shared = shared.reshape(shape)
+    if node_comm.Get_rank() == 0:
+        shared[:] = pauli_ops
+    node_comm.Barrier()
+    shared.flags.writeable = False
+    return shared, params, win
+
+
+def encode_pauli_strings(ansatz: list[str]) -> np.ndarray:
+    """Encode Pauli strings as an int8 array.
+
+    Parameters
+    ----------
+    ansatz : list[str]
+        List of Pauli strings of the same length.
+
+    Returns
+    -------
+    numpy.ndarray
+        (n_ops, n_qubits) int8 array, with the Pauli PAULI_LABELS[k] encoded as k.
+
+    Raises
+    ------
+    ValueError
+        If the Pauli strings are of different length.
+
+    """
+    num_qubits = len(ansatz[0]) if ansatz else 0
+    if not all(len(pauli_string) == num_qubits for pauli_string in ansatz):
+        raise ValueError("Pauli strings in the ansatz are of different size")
+    return np.array(
+        [[PAULI_LABELS.index(el) for el in pauli_string] for pauli_string in ansatz],
+        dtype=np.int8,
+    ).reshape(len(ansatz), num_qubits)
+
+
+def decode_pauli_strings(pauli_ops: np.ndarray) -> list[str]:
+    """Decode Pauli strings encoded with encode_pauli_strings.
+
+    Parameters
+    ----------
+    pauli_ops : numpy.ndarray
+        (n_ops, n_qubits) integer array, with the Pauli PAULI_LABELS[k] encoded
+        as k.
+
+    Returns
+    -------
+    list[str]
+        List of Pauli strings.
+
+    Raises
+    ------
+    ValueError
+        If the array contains invalid Pauli operator codes.
+
+    """
+    # The codes are read as unsigned integers, such that negative codes are out of
+    # range as well (instead of wrapping around in PAULI_LABELS).
+    try:
+        return [
+            "".join(PAULI_LABELS[k] for k in row) for row in pauli_ops.astype(np.uint8)
+        ]
+    except IndexError as err:
+        raise ValueError("Ansatz array contains invalid Pauli operator codes") from err
+
+
+def write_ansatz_npy(filename: str, ansatz: list[str], params: list[float]) -> None:
+    """Write ansatz in the binary format.
+
+    Parameters
+    ----------
+    filename : str
+        Path to the .npy file to write the Pauli strings of the ansatz to. The
+        JSON manifest containing the parameters is written next to it.
+    ansatz : list[str]
+        List of Pauli strings defining the variational ansatz.
+    params : list[float]
+        List of variational parameters corresponding to each Pauli string.
+
+    Raises
+    ------
+    ValueError
+        If the Pauli strings are of different length or ansatz and params are of
+        different length.
+
+    See Also
+    --------
+    read_ansatz_npy : Function for reading an ansatz in the binary format
+
+    """
+    if len(ansatz) != len(params):
+        raise ValueError("Ansatz and parameters are of different length")
+    pauli_ops = encode_pauli_strings(ansatz)
+    np.save(filename, pauli_ops, allow_pickle=False)
+
+    manifest = {
+        "num_ops": pauli_ops.shape[0],
+        "num_qubits": pauli_ops.shape[1],
+        "pauli_labels": PAULI_LABELS,
+        "params": [float(p) for p in params],
+    }
+    with open(os.path.splitext(filename)[0] + ".json", "w") as fp:
+        json.dump(manifest, fp, indent=4)
+
+
 def pauli_string_to_quimb_gates(pauli_string: str) -> tuple[qtn.circuit.Gate, ...]:
     """Convert a Pauli string into a sequence of Quimb gates.
 
@@ -1275,6 +2178,408 @@ def p_str_exp_contr_path(
     return reh
 
 
+def p_str_exp_tn(
+    qc: qtn.circuit.Circuit, pauli_str: str, **kwargs: str | int | float | bool
+) -> qtn.TensorNetwork:
+    """Construct the simplified TN evaluating the expectation value of a Pauli string.
+
+    Parameters
+    ----------
+    qc : quimb.tensor.circuit.Circuit
+        Quantum circuit representing a state for which the expectation value
+        is computed.
+    pauli_str : str
+        Pauli string representing an observable.
+    **kwargs : dict
+        Arguments for Quimb tensor network construction:
+        simplify_sequence : str
+            Sequence of tensor network simplifications (e.g. "ADCRS")
+        dtype : str
+            Data type of the tensors
+        ...
+
+    Returns
+    -------
+    tn : TensorNetwork
+        Tensor network, the full contraction of which gives the expectation value.
+
+    """
+    where = [i for i, p in enumerate(pauli_str) if p != "I"]
+    paulis = [p for p in pauli_str if p != "I"]
+    operator = qu.pauli(paulis[0])
+    for i in range(1, len(where)):
+        operator = operator & qu.pauli(paulis[i])
+    tn: qtn.TensorNetwork = qc.local_expectation_tn(operator, where, **kwargs)
+    return tn
+
+
+def contract_on_backend(
+    tn: qtn.TensorNetwork,
+    optimize: str | ctg.PathOptimizer | ctg.ContractionTree = "auto-hq",
+    backend: str | None = None,
+) -> complex:
+    """Fully contract a tensor network using the given array backend.
+
+    For backends other than numpy (e.g. "cupy" or "jax"), the arrays of the tensor
+    network are converted to the backend before the contraction (e.g. moved to
+    the GPU), and the result is converted back.
+
+    Parameters
+    ----------
+    tn : quimb.tensor.TensorNetwork
+        Tensor network to contract, with numpy arrays.
+    optimize : str or cotengra.PathOptimizer or cotengra.ContractionTree, optional
+        Contraction path optimizer or contraction tree, by default "auto-hq".
+    backend : str or None, optional
+        Array backend to perform the contraction with. If None (default) or
+        "numpy", the contraction is performed with numpy.
+
+    Returns
+    -------
+    complex
+        Value of the contracted tensor network.
+
+    """
+    if backend is not None and backend != "numpy":
+        tn = tn.copy()
+        tn.apply_to_arrays(lambda x: ar.do("array", x, like=backend))
+    contraction: complex = tn.contract(
+        all, optimize=optimize, output_inds=(), backend=backend
+    )
+    if backend is not None and backend != "numpy":
+        contraction = ar.to_numpy(contraction)[()]
+    return contraction
+
+
+def use_local_gpu(local_rank: int) -> int:
+    """Select the GPU used by this process for CuPy contractions.
+
+    The processes on a node are distributed round-robin over the GPUs of the
+    node.
+
+    Parameters
+    ----------
+    local_rank : int
+        Rank of the process among the processes on the same node.
+
+    Returns
+    -------
+    int
+        Id of the selected GPU.
+
+    Raises
+    ------
+    ImportError
+        If CuPy is not installed.
+
+    """
+    if not cupy_available:
+        raise ImportError("The cupy backend requires CuPy to be installed")
+    device_id: int = local_rank % cupy.cuda.runtime.getDeviceCount()
+    cupy.cuda.Device(device_id).use()
+    return device_id
+
+
+def get_optimizer(
+    optimize: str | ctg.PathOptimizer,
+    max_repeats: int = 128,
+    max_time: float | None = 10.0,
+    greedy_alpha: float = 1.0,
+    temperature: float = 0.01,
+    seed: int | None = None,
+) -> str | ctg.PathOptimizer:
+    """Resolve an optimizer specification into a contraction path optimizer.
+
+    Parameters
+    ----------
+    optimize : str or cotengra.PathOptimizer
+        Optimizer specification. "hyper" creates a cotengra HyperOptimizer
+        minimizing the number of operations, "greedy" a cotengra GreedyOptimizer
+        with the size-delta objective weighted by greedy_alpha and
+        "random-greedy" a cotengra RandomGreedyOptimizer, which samples greedy
+        paths with Boltzmann weights exp(-objective / temperature). Anything else
+        is returned as is and interpreted by Quimb (e.g. "auto-hq").
+    max_repeats : int, default=128
+        Maximum number of trial paths of a hyper-optimized or random-greedy path
+        search.
+    max_time : float or None, default=10.0
+        Time budget in seconds for a single hyper-optimized path search. If None,
+        the search is only limited by max_repeats.
+    greedy_alpha : float, default=1.0
+        Weight alpha > 0 of the sizes of the contracted tensors in the greedy
+        objective size(Ti*Tj) - alpha * (size(Ti) + size(Tj)), which favors
+        contractions freeing a lot of memory. The default alpha = 1 is the
+        objective Quimb uses for "greedy".
+    temperature : float, default=0.01
+        Temperature of the random-greedy path sampling.
+    seed : int or None, default=None
+        Seed of the random-greedy path sampling.
+
+    Returns
+    -------
+    str or cotengra.PathOptimizer
+        Optimizer to pass to Quimb contraction methods.
+
+    Notes
+    -----
+    HyperOptimizer is stateful and should not be reused for different
+    contractions, therefore a new instance is created on every call. Its
+    search is performed serially, since parallelism is provided by MPI.
+
+    The hyper-optimized search samples greedy paths and, if the optional
+    kahypar package is installed (vqite[kahypar]), hypergraph partitioning
+    paths. Without kahypar, the basic "labels" partitioning cotengra falls back
+    to is not used, since it is much slower than the contractions at hand.
+
+    Cotengra scores greedy contractions by size(Ti*Tj) / c - c * (size(Ti) +
+    size(Tj)) with the cost modifier c, which ranks contractions the same as the
+    objective above with alpha = c**2.
+
+    """
+    if isinstance(optimize, str) and optimize == "greedy":
+        if greedy_alpha <= 0:
+            raise ValueError("greedy_alpha has to be positive")
+        return ctg.GreedyOptimizer(costmod=math.sqrt(greedy_alpha))
+    if isinstance(optimize, str) and optimize == "random-greedy":
+        return ctg.RandomGreedyOptimizer(
+            max_repeats=max_repeats,
+            costmod=math.sqrt(greedy_alpha),
+            temperature=temperature,
+            seed=seed,
+            parallel=False,
+        )
+    if isinstance(optimize, str) and optimize == "hyper":
+        methods = ["greedy", "kahypar"] if kahypar_available else ["greedy"]
+        return ctg.HyperOptimizer(
+            methods=methods,
+            max_repeats=max_repeats,
+            max_time=max_time,
+            parallel=False,
+            minimize="flops",
+        )
+    return optimize
+
+
+def jit_enabled() -> bool:
+    """Return whether M and V are assembled with the kernels of _core_jit.
+
+    Returns
+    -------
+    bool
+        The value of ENABLE_JIT.
+
+    Raises
+    ------
+    ImportError
+        If ENABLE_JIT is set but numba is not installed.
+
+    """
+    if ENABLE_JIT and not numba_available:
+        raise ImportError("ENABLE_JIT requires numba, install vqite[jit]")
+    return ENABLE_JIT
+
+
+def wall_time() -> float:
+    """Return the wall-clock time in seconds.
+
+    MPI.Wtime is used if MPI is available, time.time otherwise.
+
+    Returns
+    -------
+    float
+        Wall-clock time in seconds.
+
+    """
+    if mpi_available:
+        return float(MPI.Wtime())
+    return time.time()
+
+
+def as_tuple(obj: list) -> tuple:
+    """Recursively convert nested lists (e.g. read from a JSON file) into tuples.
+
+    Parameters
+    ----------
+    obj : list
+        List to convert, its elements can be lists themselves.
+
+    Returns
+    -------
+    tuple
+        The list with all (nested) lists replaced by tuples.
+
+    """
+    return tuple(as_tuple(el) if isinstance(el, list) else el for el in obj)
+
+
+def persistent_collectives_available(comm: "MPI.Comm") -> bool:
+    """Check whether MPI-4 persistent collectives can be used on a communicator.
+
+    Both the MPI library and the mpi4py build have to support them.
+
+    Parameters
+    ----------
+    comm : MPI.Comm
+        MPI communicator.
+
+    Returns
+    -------
+    bool
+        Whether persistent collectives (e.g. Allgatherv_init) are available.
+
+    """
+    return (
+        mpi_available
+        and MPI.Get_version() >= (4, 0)
+        and hasattr(comm, "Allgatherv_init")
+    )
+
+
+def tn_signature(tn: qtn.TensorNetwork) -> tuple:
+    """Compute a hashable signature of the structure of a tensor network.
+
+    The signature consists of the indices of each tensor, relabeled in the order
+    of their first appearance, and the shapes of the tensors. Two tensor networks
+    with the same signature can be contracted using the same contraction tree,
+    independently of the numerical values of the tensors and the index names.
+
+    Parameters
+    ----------
+    tn : quimb.tensor.TensorNetwork
+        Tensor network to compute the signature of.
+
+    Returns
+    -------
+    tuple
+        Tuple (inputs, shapes) of relabeled tensor indices and tensor shapes.
+
+    """
+    relabel: dict[str, str] = {}
+    inputs = tuple(
+        tuple(relabel.setdefault(ix, ctg.get_symbol(len(relabel))) for ix in t.inds)
+        for t in tn
+    )
+    shapes = tuple(t.shape for t in tn)
+    return inputs, shapes
+
+
+def encode_contraction_paths(paths: dict[str, dict]) -> np.ndarray:
+    """Encode contraction paths and tensor network signatures as a flat array.
+
+    For each of paths["m"] and paths["v"], the array contains the number of
+    paths followed by the paths. Each path is encoded as the number of tensors,
+    then for each tensor its number of indices, the indices (as the positions of
+    their symbols, see tn_signature) and the dimensions, followed by the number
+    of contractions in the SSA path and for each contraction the number of
+    contracted tensors and their SSA ids.
+
+    Parameters
+    ----------
+    paths : dict[str, dict]
+        Contraction paths, {"m": {signature: ssa_path}, "v": {...}}.
+
+    Returns
+    -------
+    numpy.ndarray
+        Flat int32 array encoding the paths.
+
+    See Also
+    --------
+    decode_contraction_paths : Function for decoding the array
+
+    """
+    out: list[int] = []
+    for name in ("m", "v"):
+        out.append(len(paths[name]))
+        for (inputs, shapes), ssa_path in paths[name].items():
+            # The symbols are relabeled in the order of their first appearance
+            # (see tn_signature), such that their positions are restored as
+            # ctg.get_symbol(position) when decoding.
+            symbols: dict[str, int] = {}
+            out.append(len(inputs))
+            for term, shape in zip(inputs, shapes, strict=True):
+                out.append(len(term))
+                out.extend(symbols.setdefault(ix, len(symbols)) for ix in term)
+                out.extend(shape)
+            out.append(len(ssa_path))
+            for contraction in ssa_path:
+                out.append(len(contraction))
+                out.extend(contraction)
+    return np.array(out, dtype=np.int32)
+
+
+def decode_contraction_paths(buf: np.ndarray) -> dict[str, dict]:
+    """Decode contraction paths encoded with encode_contraction_paths.
+
+    Parameters
+    ----------
+    buf : numpy.ndarray
+        Flat integer array encoding the paths.
+
+    Returns
+    -------
+    dict[str, dict]
+        Contraction paths, {"m": {signature: ssa_path}, "v": {...}}.
+
+    """
+    values: list[int] = buf.tolist()
+    pos = 0
+    paths: dict[str, dict] = {}
+    for name in ("m", "v"):
+        paths[name] = {}
+        n_paths = values[pos]
+        pos += 1
+        for _ in range(n_paths):
+            inputs = []
+            shapes = []
+            n_tensors = values[pos]
+            pos += 1
+            for _ in range(n_tensors):
+                ndim = values[pos]
+                inputs.append(
+                    tuple(map(ctg.get_symbol, values[pos + 1 : pos + 1 + ndim]))
+                )
+                shapes.append(tuple(values[pos + 1 + ndim : pos + 1 + 2 * ndim]))
+                pos += 1 + 2 * ndim
+            ssa_path = []
+            n_contractions = values[pos]
+            pos += 1
+            for _ in range(n_contractions):
+                n_contracted = values[pos]
+                ssa_path.append(tuple(values[pos + 1 : pos + 1 + n_contracted]))
+                pos += 1 + n_contracted
+            paths[name][(tuple(inputs), tuple(shapes))] = tuple(ssa_path)
+    return paths
+
+
+def tree_from_signature(
+    signature: tuple, ssa_path: tuple[tuple[int, ...], ...]
+) -> ctg.ContractionTree:
+    """Rebuild a contraction tree from a tensor network signature and a path.
+
+    Parameters
+    ----------
+    signature : tuple
+        Signature of a tensor network, as returned by tn_signature.
+    ssa_path : tuple[tuple[int, ...], ...]
+        Contraction path in the static single assignment (SSA) form.
+
+    Returns
+    -------
+    cotengra.ContractionTree
+        Contraction tree for full contraction of tensor networks with the
+        given signature.
+
+    """
+    inputs, shapes = signature
+    size_dict = {
+        ix: d
+        for term, shape in zip(inputs, shapes, strict=True)
+        for ix, d in zip(term, shape, strict=True)
+    }
+    return ctg.ContractionTree.from_path(inputs, (), size_dict, ssa_path=ssa_path)
+
+
 def p_str_exp_eval(
     qc: qtn.circuit.Circuit, pauli_str: str, **kwargs: str | int | float | bool
 ) -> complex:
@@ -1303,11 +2608,14 @@ def p_str_exp_eval(
     exp_val : complex
         Expectation value of the Pauli string.
 
+    See Also
+    --------
+    p_str_exp_tn : Function constructing the contracted tensor network
+
     """
-    where = [i for i, p in enumerate(pauli_str) if p != "I"]
-    paulis = [p for p in pauli_str if p != "I"]
-    operator = qu.pauli(paulis[0])
-    for i in range(1, len(where)):
-        operator = operator & qu.pauli(paulis[i])
-    exp_val: complex = qc.local_expectation(operator, where, **kwargs)
-    return exp_val
+    optimize = kwargs.pop("optimize", "auto-hq")
+    backend = kwargs.pop("backend", None)
+    tn = p_str_exp_tn(qc=qc, pauli_str=pauli_str, **kwargs)
+    return contract_on_backend(
+        tn, optimize=optimize, backend=None if backend is None else str(backend)
+    )